@@ -6,16 +6,20 @@ from ina219 import INA219
 SHUNT_OHMS = 0.1
 MAX_EXPECTED_AMPS = 0.2
 
+logging.basicConfig(format='%(asctime)s - %(levelname)s - %(message)s')
+
 
 def read():
     ina = INA219(SHUNT_OHMS, MAX_EXPECTED_AMPS, log_level=logging.INFO)
     ina.configure(ina.RANGE_16V, ina.GAIN_AUTO)
 
-    print("Bus Voltage    : %.3f V" % ina.voltage())
-    print("Bus Current    : %.3f mA" % ina.current())
-    print("Supply Voltage : %.3f V" % ina.supply_voltage())
-    print("Shunt voltage  : %.3f mV" % ina.shunt_voltage())
-    print("Power          : %.3f mW" % ina.power())
+    reading = ina.read_all()
+    print("Bus Voltage    : %.3f V" % reading.voltage)
+    print("Bus Current    : %.3f mA" % reading.current)
+    print("Supply Voltage : %.3f V" %
+          (reading.voltage + reading.shunt_voltage / 1000))
+    print("Shunt voltage  : %.3f mV" % reading.shunt_voltage)
+    print("Power          : %.3f mW" % reading.power)
 
 
 if __name__ == "__main__":
@@ -2,11 +2,112 @@
 
 Supports the Raspberry Pi using the I2C bus.
 """
+import asyncio
+import concurrent.futures
 import logging
+import struct
+import threading
+from bisect import bisect_right
 import time
-from math import trunc
+from collections import namedtuple
+from fractions import Fraction
 import Adafruit_GPIO.I2C as I2C
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import smbus2
+except ImportError:
+    smbus2 = None
+
+
+Reading = namedtuple('Reading', 'voltage shunt_voltage current power')
+
+_PACK_BE16 = struct.Struct('>H').pack
+_UNPACK_BE16 = struct.Struct('>H').unpack
+_UNPACK_SIGNED_BE16 = struct.Struct('>h').unpack
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+# Only errors are logged unless a lower log_level is passed to INA219.
+_log.setLevel(logging.ERROR)
+
+
+def _fraction(value):
+    # The exact decimal value intended by a float such as 0.1, so the
+    # calibration does not depend on binary floating point rounding. Any
+    # real number, e.g. a numpy float or Decimal, is converted first.
+    return Fraction(float(value)).limit_denominator(10 ** 9)
+
+
+_ADDRESS = 0x40
+
+_REG_CONFIG = 0x00
+_REG_SHUNTVOLTAGE = 0x01
+_REG_BUSVOLTAGE = 0x02
+_REG_POWER = 0x03
+_REG_CURRENT = 0x04
+_REG_CALIBRATION = 0x05
+
+_RST = 15
+_BRNG = 13
+_PG1 = 12
+_PG0 = 11
+_BADC4 = 10
+_BADC3 = 9
+_BADC2 = 8
+_BADC1 = 7
+_SADC4 = 6
+_SADC3 = 5
+_SADC2 = 4
+_SADC1 = 3
+_MODE3 = 2
+_MODE2 = 1
+_MODE1 = 0
+
+# Configuration register field values, pre-shifted into position.
+_BRNG_BITS = tuple(v << _BRNG for v in range(2))
+_PG_BITS = tuple(v << _PG0 for v in range(4))
+_BADC_BITS = tuple(v << _BADC1 for v in range(16))
+_SADC_BITS = tuple(v << _SADC1 for v in range(16))
+
+_OVF = 1
+_CNVR = 2
+
+_BUS_RANGE = (16, 32)
+_GAIN_VOLTS = (0.04, 0.08, 0.16, 0.32)
+
+_CONT_SH_BUS = 7
+
+# Configuration register value after power-on or reset (p19 of spec).
+_POWER_ON_CONFIG = 0x399F
+
+# Conversion time in seconds for each bus/shunt ADC setting (p27 of
+# spec), settings 4-7 repeat the 9 to 12-bit settings 0-3 and setting 8
+# is a single 12-bit sample.
+_ADC_CONVERSION_SECS = (
+    0.000084, 0.000148, 0.000276, 0.000532,
+    0.000084, 0.000148, 0.000276, 0.000532,
+    0.000532, 0.00106, 0.00213, 0.00426,
+    0.00851, 0.01702, 0.03405, 0.0681)
+# Minimum delay in seconds between reads while waiting for a conversion.
+_MIN_POLL_SECS = 0.0001
+
+_SHUNT_MILLIVOLTS_LSB = 0.01  # 10uV
+# Register LSBs per volt, dividing by these gives correctly rounded
+# volts in a single operation.
+_SHUNT_LSB_PER_VOLT = 100000  # 10uV
+_BUS_LSB_PER_VOLT = 250  # 4mV
+_CALIBRATION_FACTOR = Fraction(4096, 100000)  # 0.04096
+_MAX_CALIBRATION_VALUE = 0xFFFE  # Max value supported (65534 decimal)
+# In the spec (p17) the current LSB factor for the minimum LSB is
+# documented as 32767, but a larger value (100.1% of 32767) is used
+# to guarantee that current overflow can always be detected.
+_CURRENT_LSB_FACTOR = 32800
+
 
 class INA219:
     """Class containing the INA219 functionality."""
@@ -32,47 +133,16 @@ class INA219:
     ADC_64SAMP = 14  # 64 samples at 12-bit, conversion time 34.05ms.
     ADC_128SAMP = 15  # 128 samples at 12-bit, conversion time 68.10ms.
 
-    __ADDRESS = 0x40
-
-    __REG_CONFIG = 0x00
-    __REG_SHUNTVOLTAGE = 0x01
-    __REG_BUSVOLTAGE = 0x02
-    __REG_POWER = 0x03
-    __REG_CURRENT = 0x04
-    __REG_CALIBRATION = 0x05
-
-    __RST = 15
-    __BRNG = 13
-    __PG1 = 12
-    __PG0 = 11
-    __BADC4 = 10
-    __BADC3 = 9
-    __BADC2 = 8
-    __BADC1 = 7
-    __SADC4 = 6
-    __SADC3 = 5
-    __SADC2 = 4
-    __SADC1 = 3
-    __MODE3 = 2
-    __MODE2 = 1
-    __MODE1 = 0
-
-    __OVF = 1
-    __CNVR = 2
-
-    __BUS_RANGE = [16, 32]
-    __GAIN_VOLTS = [0.04, 0.08, 0.16, 0.32]
-
-    __CONT_SH_BUS = 7
-
     __AMP_ERR_MSG = ('Expected current %.3fA is greater '
                      'than max possible current %.3fA')
     __RNG_ERR_MSG = ('Expected amps %.2fA, out of range, use a lower '
                      'value shunt resistor')
     __VOLT_ERR_MSG = ('Invalid voltage range, must be one of: '
                       'RANGE_16V, RANGE_32V')
+    __NUMPY_ERR_MSG = 'read_many() requires the numpy package'
+    __POLL_ERR_MSG = 'Polling has already been started'
+    __CNVR_ERR_MSG = 'Timeout waiting for conversion to complete'
 
-    __LOG_FORMAT = '%(asctime)s - %(levelname)s - INA219 %(message)s'
     __LOG_MSG_1 = ('shunt ohms: %.3f, bus max volts: %d, '
                    'shunt volts max: %.2f%s, '
                    'bus ADC: %d, shunt ADC: %d')
@@ -81,18 +151,9 @@ class INA219:
     __LOG_MSG_3 = ('Current overflow detected - '
                    'attempting to increase gain')
 
-    __SHUNT_MILLIVOLTS_LSB = 0.01  # 10uV
-    __BUS_MILLIVOLTS_LSB = 4  # 4mV
-    __CALIBRATION_FACTOR = 0.04096
-    __MAX_CALIBRATION_VALUE = 0xFFFE  # Max value supported (65534 decimal)
-    # In the spec (p17) the current LSB factor for the minimum LSB is
-    # documented as 32767, but a larger value (100.1% of 32767) is used
-    # to guarantee that current overflow can always be detected.
-    __CURRENT_LSB_FACTOR = 32800
-
     def __init__(self, shunt_ohms, max_expected_amps=None,
-                 busnum=None, address=__ADDRESS,
-                 log_level=logging.ERROR):
+                 busnum=None, address=_ADDRESS,
+                 log_level=None, i2c_device=None):
         """Construct the class.
 
         Pass in the resistance of the shunt resistor and the maximum expected
@@ -101,29 +162,57 @@ class INA219:
         Arguments:
         shunt_ohms -- value of shunt resistor in Ohms (mandatory).
         max_expected_amps -- the maximum expected current in Amps (optional).
+        busnum -- the I2C bus number, determined automatically by
+            default (optional).
         address -- the I2C address of the INA219, defaults
             to *0x40* (optional).
         log_level -- set to logging.DEBUG to see detailed calibration
-            calculations (optional).
+            calculations, the application must configure logging output,
+            e.g. with logging.basicConfig(). This sets the level of the
+            'ina219' logger shared by all instances, so it also applies
+            to instances created later without a log_level. Only errors
+            are logged until a level is set (optional).
+        i2c_device -- an I2cDevice used to communicate with the INA219,
+            for example an Smbus2I2cDevice, in which case busnum and address
+            are ignored. Defaults to an Adafruit_GPIO I2C device (optional).
         """
-        if len(logging.getLogger().handlers) == 0:
-            # Initialize the root logger only if it hasn't been done yet by a
-            # parent module.
-            logging.basicConfig(level=log_level, format=self.__LOG_FORMAT)
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(log_level)
-
-        self._i2c = I2C.get_i2c_device(address=address, busnum=busnum)
-        self._shunt_ohms = shunt_ohms
-        self._max_expected_amps = max_expected_amps
+        self.logger = _log
+        if log_level is not None:
+            _log.setLevel(log_level)
+
+        if i2c_device is None:
+            i2c_device = I2C.get_i2c_device(address=address, busnum=busnum)
+        self._i2c = i2c_device
+        # Stored as floats so any real number, e.g. a Decimal, can be used
+        # in the float arithmetic.
+        self._shunt_ohms = float(shunt_ohms)
+        self._max_expected_amps = None if max_expected_amps is None \
+            else float(max_expected_amps)
+        # The exact shunt resistance used by the calibration calculations.
+        self._shunt_ohms_exact = _fraction(shunt_ohms)
         self._min_device_current_lsb = self._calculate_min_current_lsb()
         self._gain = None
         self._auto_gain_enabled = False
+        self._check_overflow = True
+        self._conversion_secs = 0
+        self._bus_register = None
+        self._bus_register_time = None
+        self._config_word = None
+        self._configured = None
+        self._poll_thread = None
+        self._poll_stop = threading.Event()
 
     def configure(self, voltage_range=RANGE_32V, gain=GAIN_AUTO,
-                  bus_adc=ADC_12BIT, shunt_adc=ADC_12BIT):
+                  bus_adc=ADC_12BIT, shunt_adc=ADC_12BIT,
+                  check_overflow=True):
         """Configure and calibrate how the INA219 will take measurements.
 
+        A repeated call with the same arguments makes no register writes
+        if the configuration has not been changed since, e.g. by sleep().
+        If the device may have lost its registers, for example because
+        its power was cycled, call reset() first to force a full
+        configuration.
+
         Arguments:
         voltage_range -- The full scale voltage range, this is either 16V
             or 32V represented by one of the following constants;
@@ -144,41 +233,61 @@ class INA219:
             ADC_10BIT, ADC_11BIT, ADC_12BIT (default),
             ADC_2SAMP, ADC_4SAMP, ADC_8SAMP, ADC_16SAMP,
             ADC_32SAMP, ADC_64SAMP, ADC_128SAMP
+        check_overflow -- if False, current(), power() and shunt_voltage()
+            do not read the bus voltage register to check for current
+            overflow, saving an I2C read for each call. Only use this
+            when the shunt and gain are known to cover the expected
+            current. supply_voltage(), read_all() and read_many()
+            read the bus voltage register anyway, so always check.
+            Ignored when the gain is determined automatically,
+            default True (optional).
         """
+        settings = (voltage_range, gain, bus_adc, shunt_adc, check_overflow)
+        if self._config_word is not None and \
+                self._configured == (settings, self._config_word):
+            # Already configured with these settings and the device
+            # configuration has not changed since.
+            return
+
         self.__validate_voltage_range(voltage_range)
-        self._voltage_range = voltage_range
 
+        auto_gain_enabled = False
         if self._max_expected_amps is not None:
             if gain == self.GAIN_AUTO:
-                self._auto_gain_enabled = True
-                self._gain = self._determine_gain(self._max_expected_amps)
-            else:
-                self._gain = gain
-        else:
-            if gain != self.GAIN_AUTO:
-                self._gain = gain
-            else:
-                self._auto_gain_enabled = True
-                self._gain = self.GAIN_1_40MV
-
-        self.logger.info('gain set to %.2fV' % self.__GAIN_VOLTS[self._gain])
-
-        self.logger.debug(
-            self.__LOG_MSG_1 %
-            (self._shunt_ohms, self.__BUS_RANGE[voltage_range],
-             self.__GAIN_VOLTS[self._gain],
-             self.__max_expected_amps_to_string(self._max_expected_amps),
-             bus_adc, shunt_adc))
-
+                auto_gain_enabled = True
+                gain = self._determine_gain(self._max_expected_amps)
+        elif gain == self.GAIN_AUTO:
+            auto_gain_enabled = True
+            gain = self.GAIN_1_40MV
+
+        _log.info('gain set to %.2fV', _GAIN_VOLTS[gain])
+
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug(
+                self.__LOG_MSG_1,
+                self._shunt_ohms, _BUS_RANGE[voltage_range],
+                _GAIN_VOLTS[gain],
+                self.__max_expected_amps_to_string(self._max_expected_amps),
+                bus_adc, shunt_adc)
+
+        # The state is only updated once the device has been calibrated
+        # and configured, so if either fails a retry is not skipped and
+        # the state still matches the device.
+        self._configured = None
         self._calibrate(
-            self.__BUS_RANGE[voltage_range], self.__GAIN_VOLTS[self._gain],
+            _BUS_RANGE[voltage_range], _GAIN_VOLTS[gain],
             self._max_expected_amps)
-        self._configure(voltage_range, self._gain, bus_adc, shunt_adc)
+        self._configure(voltage_range, gain, bus_adc, shunt_adc)
+        self._voltage_range = voltage_range
+        self._gain = gain
+        self._auto_gain_enabled = auto_gain_enabled
+        # Auto gain relies on the overflow flag to increase the gain.
+        self._check_overflow = check_overflow or auto_gain_enabled
+        self._configured = (settings, self._config_word)
 
     def voltage(self):
         """Return the bus voltage in volts."""
-        value = self._voltage_register()
-        return float(value) * self.__BUS_MILLIVOLTS_LSB / 1000
+        return (self._read_voltage_register() >> 3) / _BUS_LSB_PER_VOLT
 
     def supply_voltage(self):
         """Return the bus supply voltage in volts.
@@ -186,40 +295,148 @@ class INA219:
         This is the sum of the bus voltage and shunt voltage. A
         DeviceRangeError exception is thrown if current overflow occurs.
         """
-        return self.voltage() + (float(self.shunt_voltage()) / 1000)
+        bus_register = self._handle_current_overflow()
+        return ((bus_register >> 3) / _BUS_LSB_PER_VOLT +
+                self._shunt_voltage_register() / _SHUNT_LSB_PER_VOLT)
 
     def current(self):
         """Return the bus current in milliamps.
 
-        A DeviceRangeError exception is thrown if current overflow occurs.
+        A DeviceRangeError exception is thrown if current overflow occurs,
+        unless configured with check_overflow False.
         """
-        self._handle_current_overflow()
-        return self._current_register() * self._current_lsb * 1000
+        if self._check_overflow:
+            self._handle_current_overflow()
+        return self._current_register() * self._current_lsb_ma
 
     def power(self):
         """Return the bus power consumption in milliwatts.
 
-        A DeviceRangeError exception is thrown if current overflow occurs.
+        A DeviceRangeError exception is thrown if current overflow occurs,
+        unless configured with check_overflow False.
         """
-        self._handle_current_overflow()
-        return self._power_register() * self._power_lsb * 1000
+        if self._check_overflow:
+            self._handle_current_overflow()
+        return self._power_register() * self._power_lsb_mw
 
     def shunt_voltage(self):
         """Return the shunt voltage in millivolts.
 
-        A DeviceRangeError exception is thrown if current overflow occurs.
+        A DeviceRangeError exception is thrown if current overflow occurs,
+        unless configured with check_overflow False.
+        """
+        if self._check_overflow:
+            self._handle_current_overflow()
+        return self._shunt_voltage_register() * _SHUNT_MILLIVOLTS_LSB
+
+    def read_all(self, wait_for_conversion=False):
+        """Return the bus voltage, shunt voltage, current and power together.
+
+        The values are returned as a Reading named tuple with the fields
+        voltage (V), shunt_voltage (mV), current (mA) and power (mW). Each
+        register is read once and the overflow check uses the same bus
+        voltage read, so this is cheaper than calling each function in
+        turn. A DeviceRangeError exception is thrown if current overflow
+        occurs.
+
+        Arguments:
+        wait_for_conversion -- if True wait until the conversion ready
+            flag is set, i.e. a conversion has completed since the power
+            register was last read, e.g. by a previous read_all(). A
+            TimeoutError exception is thrown if no conversion completes
+            within twice the conversion time, for example because the
+            device is asleep, defaults to False (optional).
+        """
+        if wait_for_conversion:
+            self._wait_conversion_ready()
+        bus_register = self._handle_current_overflow()
+        return Reading(
+            (bus_register >> 3) / _BUS_LSB_PER_VOLT,
+            self._shunt_voltage_register() * _SHUNT_MILLIVOLTS_LSB,
+            self._current_register() * self._current_lsb_ma,
+            self._power_register() * self._power_lsb_mw)
+
+    def read_many(self, count, interval=None):
+        """Return a number of readings of all measurements as NumPy arrays.
+
+        The values are returned as a Reading named tuple, as for read_all(),
+        where each field is a NumPy array with one element per reading. The
+        raw register values are collected first and converted in a single
+        pass. A DeviceRangeError exception is thrown if current overflow
+        occurs. Requires the numpy package.
+
+        Arguments:
+        count -- the number of readings to take (mandatory).
+        interval -- the delay between readings in seconds (optional).
+        """
+        if numpy is None:
+            raise ImportError(self.__NUMPY_ERR_MSG)
+        registers = numpy.empty((count, 4), dtype=numpy.int32)
+        # Auto gain may change the LSBs part way through, so record the
+        # values in effect for each reading.
+        lsbs = numpy.empty((count, 2))
+        for i in range(count):
+            if interval and i > 0:
+                time.sleep(interval)
+            bus_register = self._handle_current_overflow()
+            registers[i] = (bus_register >> 3,
+                            self._shunt_voltage_register(),
+                            self._current_register(),
+                            self._power_register())
+            lsbs[i] = (self._current_lsb_ma, self._power_lsb_mw)
+        return Reading(
+            registers[:, 0] / _BUS_LSB_PER_VOLT,
+            registers[:, 1] * _SHUNT_MILLIVOLTS_LSB,
+            registers[:, 2] * lsbs[:, 0],
+            registers[:, 3] * lsbs[:, 1])
+
+    def start_polling(self, interval, on_reading, on_error=None):
+        """Start taking readings in a background thread.
+
+        Every interval seconds read_all() is called and the Reading passed
+        to on_reading. If a reading is late then any missed readings are
+        skipped, rather than taken in a burst to catch up. The INA219 should
+        not be used from other threads while polling.
+
+        Arguments:
+        interval -- the time between readings in seconds (mandatory).
+        on_reading -- function called with each Reading (mandatory).
+        on_error -- function called with any exception raised while
+            reading or by on_reading, e.g. a DeviceRangeError if current
+            overflow occurs or an OSError from the I2C bus, after which
+            polling continues. An exception raised by on_error is logged.
+            If not set the exception is logged and polling stops
+            (optional).
         """
-        self._handle_current_overflow()
-        return self._shunt_voltage_register() * self.__SHUNT_MILLIVOLTS_LSB
+        if self._poll_thread is not None and self._poll_thread.is_alive():
+            raise RuntimeError(self.__POLL_ERR_MSG)
+        # Each thread has its own stop event, so a thread stopped from
+        # within a callback cannot be resumed by a later start.
+        self._poll_stop = threading.Event()
+        self._poll_thread = threading.Thread(
+            target=self._poll,
+            args=(interval, on_reading, on_error, self._poll_stop))
+        self._poll_thread.daemon = True
+        self._poll_thread.start()
+
+    def stop_polling(self):
+        """Stop taking readings started by start_polling()."""
+        thread = self._poll_thread
+        if thread is None:
+            return
+        self._poll_stop.set()
+        if thread is not threading.current_thread():
+            thread.join()
+        self._poll_thread = None
 
     def sleep(self):
         """Put the INA219 into power down mode."""
-        configuration = self._read_configuration()
+        configuration = self._configuration()
         self._configuration_register(configuration & 0xFFF8)
 
     def wake(self):
         """Wake the INA219 from power down mode."""
-        configuration = self._read_configuration()
+        configuration = self._configuration()
         self._configuration_register(configuration | 0x0007)
         # 40us delay to recover from powerdown (p14 of spec)
         time.sleep(0.00004)
@@ -233,158 +450,235 @@ class INA219:
 
     def reset(self):
         """Reset the INA219 to its default configuration."""
-        self._configuration_register(1 << self.__RST)
+        self._configuration_register(1 << _RST)
+        # The device registers are now the power-on defaults, which
+        # includes a zero calibration, so configure() must be called again.
+        self._config_word = _POWER_ON_CONFIG
+        self._configured = None
+        # Auto gain steps from the gain the device is using, which is now
+        # the power-on 320mV range.
+        self._gain = (_POWER_ON_CONFIG >> _PG0) & 3
+        self._voltage_range = (_POWER_ON_CONFIG >> _BRNG) & 1
+        # Power-on conversions use 12-bit bus and shunt ADCs, so a bus
+        # read from before the reset must not be reused.
+        self._conversion_secs = 2 * _ADC_CONVERSION_SECS[self.ADC_12BIT]
+        self._bus_register_time = None
 
     def is_conversion_ready(self):
         """Check if conversion of a new reading has occured."""
-        cnvr = self._read_voltage_register() & self.__CNVR
-        return (cnvr == self.__CNVR)
+        cnvr = self._read_voltage_register() & _CNVR
+        return (cnvr == _CNVR)
 
     def _handle_current_overflow(self):
+        register_value = self._recent_voltage_register()
         if self._auto_gain_enabled:
-            while self._has_current_overflow():
+            while register_value & _OVF:
                 self._increase_gain()
-        else:
-            if self._has_current_overflow():
-                raise DeviceRangeError(self.__GAIN_VOLTS[self._gain])
+                register_value = self._recent_voltage_register()
+        elif register_value & _OVF:
+            raise DeviceRangeError(_GAIN_VOLTS[self._gain])
+        return register_value
+
+    def _poll(self, interval, on_reading, on_error, stop):
+        next_time = time.monotonic()
+        while not stop.is_set():
+            try:
+                on_reading(self.read_all())
+            except Exception as error:
+                if on_error is None:
+                    _log.exception('Polling stopped: %s', error)
+                    return
+                try:
+                    on_error(error)
+                except Exception:
+                    _log.exception('Polling error handler failed')
+            next_time += interval
+            delay = next_time - time.monotonic()
+            if delay < 0:
+                next_time = time.monotonic()
+                delay = 0
+            stop.wait(delay)
+
+    def _wait_conversion_ready(self):
+        # Poll the CNVR flag, which is set when a conversion completes and
+        # cleared only by reading the power register or writing the
+        # configuration, not by reading the bus voltage register. The bus
+        # voltage read made while polling is reused by the next overflow
+        # check, so no extra read is needed when already ready. The delay
+        # between polls doubles up to the conversion time, so long
+        # averaging conversions do not flood the bus with reads, and has
+        # a minimum so the bus is never polled without a pause. A timeout
+        # raises, as the registers still hold an earlier conversion, which
+        # after a gain change would give a stale overflow flag.
+        deadline = time.monotonic() + max(0.01, 2 * self._conversion_secs)
+        delay = max(self._conversion_secs / 16, _MIN_POLL_SECS)
+        max_delay = max(self._conversion_secs, _MIN_POLL_SECS)
+        while not self._read_voltage_register() & _CNVR:
+            if time.monotonic() > deadline:
+                raise TimeoutError(self.__CNVR_ERR_MSG)
+            time.sleep(delay)
+            delay = min(2 * delay, max_delay)
 
     def _determine_gain(self, max_expected_amps):
         shunt_v = max_expected_amps * self._shunt_ohms
-        if shunt_v > self.__GAIN_VOLTS[3]:
+        # The lowest gain with a maximum shunt voltage above shunt_v.
+        gain = bisect_right(_GAIN_VOLTS, shunt_v)
+        if gain == len(_GAIN_VOLTS):
             raise ValueError(self.__RNG_ERR_MSG % max_expected_amps)
-        gain = min(v for v in self.__GAIN_VOLTS if v > shunt_v)
-        return self.__GAIN_VOLTS.index(gain)
+        return gain
 
     def _increase_gain(self):
-        self.logger.info(self.__LOG_MSG_3)
-        gain = self._read_gain()
-        if gain < len(self.__GAIN_VOLTS) - 1:
+        _log.info(self.__LOG_MSG_3)
+        gain = self._gain
+        if gain < len(_GAIN_VOLTS) - 1:
             gain = gain + 1
-            self._calibrate(self.__BUS_RANGE[self._voltage_range],
-                            self.__GAIN_VOLTS[gain])
+            self._calibrate(_BUS_RANGE[self._voltage_range],
+                            _GAIN_VOLTS[gain])
             self._configure_gain(gain)
-            # 1ms delay required for new configuration to take effect,
-            # otherwise invalid current/power readings can occur.
-            time.sleep(0.001)
+            # Wait for a conversion with the new configuration to complete,
+            # otherwise invalid current/power readings can occur. Writing
+            # the configuration cleared any earlier conversion ready flag.
+            self._wait_conversion_ready()
         else:
-            self.logger.info('Device limit reach, gain cannot be increased')
-            raise DeviceRangeError(self.__GAIN_VOLTS[gain], True)
+            _log.info('Device limit reach, gain cannot be increased')
+            raise DeviceRangeError(_GAIN_VOLTS[gain], True)
 
     def _configure(self, voltage_range, gain, bus_adc, shunt_adc):
+        self._conversion_secs = (_ADC_CONVERSION_SECS[bus_adc] +
+                                 _ADC_CONVERSION_SECS[shunt_adc])
         configuration = (
-            voltage_range << self.__BRNG | gain << self.__PG0 |
-            bus_adc << self.__BADC1 | shunt_adc << self.__SADC1 |
-            self.__CONT_SH_BUS)
+            _BRNG_BITS[voltage_range] | _PG_BITS[gain] |
+            _BADC_BITS[bus_adc] | _SADC_BITS[shunt_adc] |
+            _CONT_SH_BUS)
         self._configuration_register(configuration)
 
     def _calibrate(self, bus_volts_max, shunt_volts_max,
                    max_expected_amps=None):
-        self.logger.info(
-            self.__LOG_MSG_2 %
-            (bus_volts_max, shunt_volts_max,
-             self.__max_expected_amps_to_string(max_expected_amps)))
+        if _log.isEnabledFor(logging.INFO):
+            _log.info(
+                self.__LOG_MSG_2, bus_volts_max, shunt_volts_max,
+                self.__max_expected_amps_to_string(max_expected_amps))
 
-        max_possible_amps = shunt_volts_max / self._shunt_ohms
+        # The calibration is calculated with exact fractions and only the
+        # resulting LSBs are converted to floats.
+        shunt_ohms = self._shunt_ohms_exact
+        max_possible_amps = _fraction(shunt_volts_max) / shunt_ohms
 
-        self.logger.info("max possible current: %.3fA" %
-                         max_possible_amps)
+        _log.info("max possible current: %.3fA", max_possible_amps)
 
-        self._current_lsb = \
+        current_lsb = \
             self._determine_current_lsb(max_expected_amps, max_possible_amps)
-        self.logger.info("current LSB: %.3e A/bit" % self._current_lsb)
+        self._current_lsb = float(current_lsb)
+        _log.info("current LSB: %.3e A/bit", self._current_lsb)
 
         self._power_lsb = self._current_lsb * 20
-        self.logger.info("power LSB: %.3e W/bit" % self._power_lsb)
+        _log.info("power LSB: %.3e W/bit", self._power_lsb)
+
+        # Scale factors for the milliamp/milliwatt values returned to the
+        # caller, so each read is a single multiplication.
+        self._current_lsb_ma = self._current_lsb * 1000
+        self._power_lsb_mw = self._power_lsb * 1000
 
         max_current = self._current_lsb * 32767
-        self.logger.info("max current before overflow: %.4fA" % max_current)
+        _log.info("max current before overflow: %.4fA", max_current)
 
         max_shunt_voltage = max_current * self._shunt_ohms
-        self.logger.info("max shunt voltage before overflow: %.4fmV" %
-                         (max_shunt_voltage * 1000))
+        _log.info("max shunt voltage before overflow: %.4fmV",
+                  max_shunt_voltage * 1000)
 
-        calibration = trunc(self.__CALIBRATION_FACTOR /
-                            (self._current_lsb * self._shunt_ohms))
-        self.logger.info(
-            "calibration: 0x%04x (%d)" % (calibration, calibration))
+        calibration = int(_CALIBRATION_FACTOR /
+                          (current_lsb * shunt_ohms))
+        _log.info("calibration: 0x%04x (%d)", calibration, calibration)
         self._calibration_register(calibration)
 
     def _determine_current_lsb(self, max_expected_amps, max_possible_amps):
         if max_expected_amps is not None:
+            max_expected_amps = _fraction(max_expected_amps)
             if max_expected_amps > round(max_possible_amps, 3):
                 raise ValueError(self.__AMP_ERR_MSG %
                                  (max_expected_amps, max_possible_amps))
-            self.logger.info("max expected current: %.3fA" %
-                             max_expected_amps)
-            if max_expected_amps < max_possible_amps:
-                current_lsb = max_expected_amps / self.__CURRENT_LSB_FACTOR
-            else:
-                current_lsb = max_possible_amps / self.__CURRENT_LSB_FACTOR
+            _log.info("max expected current: %.3fA", max_expected_amps)
+            max_amps = min(max_expected_amps, max_possible_amps)
         else:
-            current_lsb = max_possible_amps / self.__CURRENT_LSB_FACTOR
-
-        if current_lsb < self._min_device_current_lsb:
-            current_lsb = self._min_device_current_lsb
-        return current_lsb
+            max_amps = max_possible_amps
+        return max(max_amps / _CURRENT_LSB_FACTOR,
+                   self._min_device_current_lsb)
 
     def _configuration_register(self, register_value):
-        self.logger.debug("configuration: 0x%04x" % register_value)
-        self.__write_register(self.__REG_CONFIG, register_value)
+        _log.debug("configuration: 0x%04x", register_value)
+        self._bus_register_time = None
+        self.__write_register(_REG_CONFIG, register_value)
+        self._config_word = register_value
 
     def _read_configuration(self):
-        return self.__read_register(self.__REG_CONFIG)
+        return self.__read_register(_REG_CONFIG)
 
-    def _calculate_min_current_lsb(self):
-        return self.__CALIBRATION_FACTOR / \
-            (self._shunt_ohms * self.__MAX_CALIBRATION_VALUE)
+    def _configuration(self):
+        # The last configuration written, avoiding a read of the device
+        # register for read-modify-write updates.
+        if self._config_word is None:
+            return self._read_configuration()
+        return self._config_word
 
-    def _read_gain(self):
-        configuration = self._read_configuration()
-        gain = (configuration & 0x1800) >> self.__PG0
-        self.logger.info("gain is currently: %.2fV" % self.__GAIN_VOLTS[gain])
-        return gain
+    def _calculate_min_current_lsb(self):
+        return _CALIBRATION_FACTOR / \
+            (self._shunt_ohms_exact * _MAX_CALIBRATION_VALUE)
 
     def _configure_gain(self, gain):
-        configuration = self._read_configuration()
+        configuration = self._configuration()
         configuration = configuration & 0xE7FF
-        self._configuration_register(configuration | (gain << self.__PG0))
+        self._configuration_register(configuration | _PG_BITS[gain])
         self._gain = gain
-        self.logger.info("gain set to: %.2fV" % self.__GAIN_VOLTS[gain])
+        _log.info("gain set to: %.2fV", _GAIN_VOLTS[gain])
 
     def _calibration_register(self, register_value):
-        self.logger.debug("calibration: 0x%04x" % register_value)
-        self.__write_register(self.__REG_CALIBRATION, register_value)
+        _log.debug("calibration: 0x%04x", register_value)
+        self._bus_register_time = None
+        self.__write_register(_REG_CALIBRATION, register_value)
 
     def _has_current_overflow(self):
-        ovf = self._read_voltage_register() & self.__OVF
+        ovf = self._read_voltage_register() & _OVF
         return (ovf == 1)
 
-    def _voltage_register(self):
-        register_value = self._read_voltage_register()
-        return register_value >> 3
-
     def _read_voltage_register(self):
-        return self.__read_register(self.__REG_BUSVOLTAGE)
+        register_value = self.__read_register(_REG_BUSVOLTAGE)
+        self._bus_register = register_value
+        self._bus_register_time = time.monotonic()
+        return register_value
+
+    def _recent_voltage_register(self):
+        # Reuse the bus voltage register (and so its OVF bit) from a read
+        # made within the last conversion period, e.g. by voltage(), as at
+        # most one new conversion can have completed since. The value is
+        # used only once, so the next call always reads the device.
+        if self._bus_register_time is not None and \
+                time.monotonic() - self._bus_register_time < \
+                self._conversion_secs:
+            register_value = self._bus_register
+        else:
+            register_value = self._read_voltage_register()
+        self._bus_register_time = None
+        return register_value
 
     def _current_register(self):
-        return self.__read_register(self.__REG_CURRENT, True)
+        return self.__read_register(_REG_CURRENT, True)
 
     def _shunt_voltage_register(self):
-        return self.__read_register(self.__REG_SHUNTVOLTAGE, True)
+        return self.__read_register(_REG_SHUNTVOLTAGE, True)
 
     def _power_register(self):
-        return self.__read_register(self.__REG_POWER)
+        return self.__read_register(_REG_POWER)
 
     def __validate_voltage_range(self, voltage_range):
-        if voltage_range > len(self.__BUS_RANGE) - 1:
+        if voltage_range > len(_BUS_RANGE) - 1:
             raise ValueError(self.__VOLT_ERR_MSG)
 
     def __write_register(self, register, register_value):
-        register_bytes = self.__to_bytes(register_value)
-        self.logger.debug(
-            "write register 0x%02x: 0x%04x 0b%s" %
-            (register, register_value,
-             self.__binary_as_string(register_value)))
+        register_bytes = _PACK_BE16(register_value & 0xFFFF)
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug(
+                "write register 0x%02x: 0x%04x 0b%s", register,
+                register_value, format(register_value, '016b'))
         self._i2c.writeList(register, register_bytes)
 
     def __read_register(self, register, negative_value_supported=False):
@@ -392,18 +686,12 @@ class INA219:
             register_value = self._i2c.readS16BE(register)
         else:
             register_value = self._i2c.readU16BE(register)
-        self.logger.debug(
-            "read register 0x%02x: 0x%04x 0b%s" %
-            (register, register_value,
-             self.__binary_as_string(register_value)))
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug(
+                "read register 0x%02x: 0x%04x 0b%s", register,
+                register_value, format(register_value, '016b'))
         return register_value
 
-    def __to_bytes(self, register_value):
-        return [(register_value >> 8) & 0xFF, register_value & 0xFF]
-
-    def __binary_as_string(self, register_value):
-        return bin(register_value)[2:].zfill(16)
-
     def __max_expected_amps_to_string(self, max_expected_amps):
         if max_expected_amps is None:
             return ''
@@ -425,3 +713,158 @@ class DeviceRangeError(Exception):
         super(DeviceRangeError, self).__init__(msg)
         self.gain_volts = gain_volts
         self.device_limit_reached = device_max
+
+
+class AsyncINA219:
+    """Class providing asyncio coroutines for reading an INA219.
+
+    Each read runs in a thread of its own, so it does not block the event
+    loop, and reads are serialised so only one accesses the device at a
+    time.
+    """
+
+    def __init__(self, ina):
+        """Construct the class.
+
+        Arguments:
+        ina -- the configured INA219 instance to read (mandatory).
+        """
+        self._ina = ina
+        # A single worker runs one read at a time, even when the awaiting
+        # task is cancelled or reads come from different event loops,
+        # without occupying the event loop's default executor.
+        self._executor = concurrent.futures.ThreadPoolExecutor(1)
+
+    async def read_all(self, wait_for_conversion=False):
+        """Return a Reading of all measurements, see INA219.read_all()."""
+        return await self._run(self._ina.read_all, wait_for_conversion)
+
+    async def voltage(self):
+        """Return the bus voltage in volts."""
+        return await self._run(self._ina.voltage)
+
+    async def supply_voltage(self):
+        """Return the bus supply voltage in volts."""
+        return await self._run(self._ina.supply_voltage)
+
+    async def current(self):
+        """Return the bus current in milliamps."""
+        return await self._run(self._ina.current)
+
+    async def power(self):
+        """Return the bus power consumption in milliwatts."""
+        return await self._run(self._ina.power)
+
+    async def shunt_voltage(self):
+        """Return the shunt voltage in millivolts."""
+        return await self._run(self._ina.shunt_voltage)
+
+    async def sample_forever(self, interval):
+        """Yield a Reading from read_all() every interval seconds.
+
+        An asynchronous generator for use with async for. As for
+        INA219.start_polling(), if a reading is late then any missed
+        readings are skipped. Exceptions, e.g. DeviceRangeError, are
+        raised in the consumer.
+
+        Arguments:
+        interval -- the time between readings in seconds (mandatory).
+        """
+        loop = asyncio.get_running_loop()
+        next_time = loop.time()
+        while True:
+            yield await self.read_all()
+            next_time += interval
+            delay = next_time - loop.time()
+            if delay < 0:
+                next_time = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    async def _run(self, function, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, function, *args)
+
+
+class I2cDevice:
+    """Interface of the I2C device used by the INA219 class.
+
+    The methods match those of the Adafruit_GPIO I2C Device class, which
+    is used by default.
+    """
+
+    def readU16BE(self, register):
+        """Read an unsigned big endian 16-bit value from a register."""
+        raise NotImplementedError
+
+    def readS16BE(self, register):
+        """Read a signed big endian 16-bit value from a register."""
+        raise NotImplementedError
+
+    def writeList(self, register, data):
+        """Write bytes to a register.
+
+        The INA219 class always passes data as a bytes object.
+        """
+        raise NotImplementedError
+
+
+class Smbus2I2cDevice(I2cDevice):
+    """I2C device using the smbus2 library.
+
+    Each register read is a single combined write and read transaction,
+    using a repeated start, rather than two separate transactions. Devices
+    on the same I2C bus share a single open bus.
+    """
+
+    __SMBUS2_ERR_MSG = 'Smbus2I2cDevice requires the smbus2 package'
+
+    # Open buses keyed by bus number. Each transaction is a single
+    # i2c_rdwr ioctl, which the kernel serialises, so only opening a bus
+    # needs a lock.
+    _buses = {}
+    _buses_lock = threading.Lock()
+
+    def __init__(self, address=_ADDRESS, busnum=None):
+        """Construct the class.
+
+        Arguments:
+        address -- the I2C address of the INA219, defaults
+            to *0x40* (optional).
+        busnum -- the I2C bus number, determined automatically by
+            default (optional).
+        """
+        if smbus2 is None:
+            raise ImportError(self.__SMBUS2_ERR_MSG)
+        if busnum is None:
+            busnum = I2C.get_default_bus()
+        self._address = address
+        self._bus = self._get_bus(busnum)
+
+    def readU16BE(self, register):
+        """Read an unsigned big endian 16-bit value from a register."""
+        return _UNPACK_BE16(self.__read(register))[0]
+
+    def readS16BE(self, register):
+        """Read a signed big endian 16-bit value from a register."""
+        return _UNPACK_SIGNED_BE16(self.__read(register))[0]
+
+    def writeList(self, register, data):
+        """Write bytes to a register."""
+        write = smbus2.i2c_msg.write(
+            self._address, bytes([register]) + bytes(data))
+        self._bus.i2c_rdwr(write)
+
+    @classmethod
+    def _get_bus(cls, busnum):
+        with cls._buses_lock:
+            bus = cls._buses.get(busnum)
+            if bus is None:
+                bus = cls._buses[busnum] = smbus2.SMBus(busnum)
+            return bus
+
+    def __read(self, register):
+        write = smbus2.i2c_msg.write(self._address, [register])
+        read = smbus2.i2c_msg.read(self._address, 2)
+        self._bus.i2c_rdwr(write, read)
+        return bytes(read)
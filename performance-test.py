@@ -7,6 +7,8 @@ from ina219 import INA219
 SHUNT_OHMS = 0.1
 MAX_EXPECTED_AMPS = 0.2
 
+logging.basicConfig(format='%(asctime)s - %(levelname)s - %(message)s')
+
 READS = 100
 
 
@@ -18,8 +20,10 @@ def init():
 
 
 def read():
+    # Bind the method once so the loop measures the read, not the lookup.
+    voltage = ina.voltage
     for x in range(0, READS):
-        ina.voltage()
+        voltage()
 
 
 if __name__ == "__main__":
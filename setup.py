@@ -16,11 +16,11 @@ classifiers = ['Development Status :: 5 - Production/Stable',
                'Operating System :: POSIX :: Linux',
                'License :: OSI Approved :: MIT License',
                'Intended Audience :: Developers',
-               'Programming Language :: Python :: 2.7',
-               'Programming Language :: Python :: 3.4',
-               'Programming Language :: Python :: 3.5',
-               'Programming Language :: Python :: 3.6',
                'Programming Language :: Python :: 3.7',
+               'Programming Language :: Python :: 3.8',
+               'Programming Language :: Python :: 3.9',
+               'Programming Language :: Python :: 3.10',
+               'Programming Language :: Python :: 3.11',
                'Topic :: System :: Hardware :: Hardware Drivers']
 
 # Define required packages.
@@ -45,6 +45,8 @@ setup(name='pi-ina219',
       url='https://github.com/chrisb2/pi_ina219/',
       classifiers=classifiers,
       keywords='ina219 raspberrypi',
+      python_requires='>=3.7',
       install_requires=requires,
+      extras_require={'numpy': ['numpy'], 'smbus2': ['smbus2']},
       test_suite='tests',
       py_modules=['ina219'])
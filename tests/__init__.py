@@ -0,0 +1,22 @@
+import sys
+import logging
+from mock import Mock, patch
+from ina219 import I2cDevice
+
+# Shared by every test module, so only one handler is installed.
+logger = logging.getLogger()
+logger.level = logging.ERROR
+logger.addHandler(logging.StreamHandler(sys.stdout))
+
+
+def patch_i2c_device(test_case):
+    """Patch the Adafruit I2C device lookup until the test case ends.
+
+    Each INA219 constructed while patched gets a new device Mock. The
+    patched get_i2c_device is returned.
+    """
+    patcher = patch('Adafruit_GPIO.I2C.get_i2c_device')
+    device = patcher.start()
+    test_case.addCleanup(patcher.stop)
+    device.side_effect = lambda **kwargs: Mock(spec_set=I2cDevice)
+    return device
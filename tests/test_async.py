@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import unittest
+from mock import Mock
+from ina219 import INA219
+from ina219 import AsyncINA219
+from ina219 import DeviceRangeError
+from tests import patch_i2c_device
+
+
+class TestAsync(unittest.TestCase):
+
+    GAIN_RANGE_MSG = r"Current out of range \(overflow\)"
+
+    def setUp(self):
+        patch_i2c_device(self)
+        self.ina = INA219(0.1, 0.4)
+        self.ina._i2c.writeList = Mock()
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        self.async_ina = AsyncINA219(self.ina)
+
+    def test_read_all(self):
+        self.ina._i2c.readU16BE = Mock(side_effect=[0x2592, 0x1ea9])
+        self.ina._i2c.readS16BE = Mock(side_effect=[0x7d0, 0x1])
+        reading = asyncio.run(self.async_ina.read_all())
+        self.assertEqual(reading.voltage, 4.808)
+        self.assertEqual(reading.shunt_voltage, 20.0)
+        self.assertAlmostEqual(reading.current, 0.012, 3)
+        self.assertAlmostEqual(reading.power, 1914.0, 0)
+
+    def test_voltage(self):
+        self.ina._i2c.readU16BE = Mock(return_value=0x2592)
+        self.assertEqual(asyncio.run(self.async_ina.voltage()), 4.808)
+
+    def test_current_overflow_error(self):
+        self.ina._i2c.readU16BE = Mock(return_value=0xfa1)
+        with self.assertRaisesRegex(DeviceRangeError, self.GAIN_RANGE_MSG):
+            asyncio.run(self.async_ina.current())
+
+    def test_concurrent_reads(self):
+        self.ina._i2c.readU16BE = Mock(return_value=0x2592)
+        self.ina._i2c.readS16BE = Mock(return_value=0x7d0)
+
+        async def read():
+            return await asyncio.gather(
+                self.async_ina.voltage(), self.async_ina.shunt_voltage(),
+                self.async_ina.supply_voltage())
+
+        self.assertEqual(asyncio.run(read())[:2], [4.808, 20.0])
+
+    def test_concurrent_reads_in_separate_event_loops(self):
+        self.ina._i2c.readU16BE = Mock(return_value=0x2592)
+
+        async def read():
+            return await asyncio.gather(
+                self.async_ina.voltage(), self.async_ina.voltage())
+
+        self.assertEqual(asyncio.run(read()), [4.808, 4.808])
+        self.assertEqual(asyncio.run(read()), [4.808, 4.808])
+
+    def test_cancelled_read_does_not_overlap_next_read(self):
+        release = threading.Event()
+        active = []
+        overlapping = []
+
+        def read_all(wait_for_conversion=False):
+            active.append(True)
+            overlapping.append(len(active) > 1)
+            release.wait(5)
+            active.pop()
+            return len(overlapping)
+
+        self.ina.read_all = read_all
+
+        async def read():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(self.async_ina.read_all(), 0.01)
+            second = asyncio.ensure_future(self.async_ina.read_all())
+            await asyncio.sleep(0.05)
+            release.set()
+            return await second
+
+        self.assertEqual(asyncio.run(read()), 2)
+        self.assertEqual(overlapping, [False, False])
+
+    def test_sample_forever(self):
+        self.ina._i2c.readU16BE = Mock(return_value=0x2592)
+        self.ina._i2c.readS16BE = Mock(return_value=0x7d0)
+
+        async def sample():
+            readings = []
+            async for reading in self.async_ina.sample_forever(0.001):
+                readings.append(reading)
+                if len(readings) == 2:
+                    break
+            return readings
+
+        readings = asyncio.run(sample())
+        self.assertEqual([r.voltage for r in readings], [4.808, 4.808])
+        self.assertEqual(readings[1].shunt_voltage, 20.0)
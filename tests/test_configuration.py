@@ -1,172 +1,201 @@
-import sys
-import logging
 import unittest
-from mock import Mock, call, patch
+from mock import Mock, call
 from ina219 import INA219
-
-logger = logging.getLogger()
-logger.level = logging.ERROR
-logger.addHandler(logging.StreamHandler(sys.stdout))
+from tests import patch_i2c_device
 
 
 class TestConfiguration(unittest.TestCase):
 
-    @patch('Adafruit_GPIO.I2C.get_i2c_device')
-    def setUp(self, device):
-        device.return_value = Mock()
+    def setUp(self):
+        patch_i2c_device(self)
         self.ina = INA219(0.1, 0.4)
         self.ina._i2c.writeList = Mock()
 
-    @patch('Adafruit_GPIO.I2C.get_i2c_device')
-    def test_calibration_register_maximum_is_fffe_1_ohm(self, device):
-        device.return_value = Mock()
+    def test_calibration_register_maximum_is_fffe_1_ohm(self):
         self.ina = INA219(1.0, 0.01)
         self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
-        calls = [call(0x05, [0xFF, 0xFE]), call(0x00, [0x01, 0x9f])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
+        calls = [call(0x05, b'\xff\xfe'), call(0x00, b'\x01\x9f')]
+        self.assertEqual(self.ina._i2c.writeList.call_args_list, calls)
 
-    @patch('Adafruit_GPIO.I2C.get_i2c_device')
-    def test_calibration_register_maximum_is_fffe_100_mohm(self, device):
-        device.return_value = Mock()
+    def test_calibration_register_maximum_is_fffe_100_mohm(self):
         self.ina = INA219(0.1, 0.1)
         self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
-        calls = [call(0x05, [0xFF, 0xFE]), call(0x00, [0x01, 0x9f])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
+        calls = [call(0x05, b'\xff\xfe'), call(0x00, b'\x01\x9f')]
+        self.assertEqual(self.ina._i2c.writeList.call_args_list, calls)
 
-    @patch('Adafruit_GPIO.I2C.get_i2c_device')
-    def test_calibration_register_maximum_is_fffe_10_mohm(self, device):
-        device.return_value = Mock()
+    def test_calibration_register_maximum_is_fffe_10_mohm(self):
         self.ina = INA219(0.01, 0.1)
         self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
-        calls = [call(0x05, [0xFF, 0xFE]), call(0x00, [0x01, 0x9f])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
+        calls = [call(0x05, b'\xff\xfe'), call(0x00, b'\x01\x9f')]
+        self.assertEqual(self.ina._i2c.writeList.call_args_list, calls)
+
+    def test_calibration_register_exact(self):
+        # 0.04096 * 32800 / (0.256 * 0.1) is exactly 52480 (0xcd00), which
+        # floating point arithmetic truncates to 52479.
+        self.ina = INA219(0.1, 0.256)
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        calls = [call(0x05, b'\xcd\x00'), call(0x00, b'\x01\x9f')]
+        self.assertEqual(self.ina._i2c.writeList.call_args_list, calls)
 
     def test_auto_gain_with_expected_amps(self):
         self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_AUTO)
         self.assertEqual(self.ina._gain, 1)
         self.assertEqual(self.ina._voltage_range, 0)
         self.assertTrue(self.ina._auto_gain_enabled)
-        calls = [call(0x05, [0x83, 0x33]), call(0x00, [0x09, 0x9f])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
+        calls = [call(0x05, b'\x83\x33'), call(0x00, b'\x09\x9f')]
+        self.assertEqual(self.ina._i2c.writeList.call_args_list, calls)
 
-    @patch('Adafruit_GPIO.I2C.get_i2c_device')
-    def test_auto_gain_no_expected_amps(self, device):
-        device.return_value = Mock()
+    def test_auto_gain_no_expected_amps(self):
         self.ina = INA219(0.1)
         self.ina._i2c.writeList = Mock()
         self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_AUTO)
         self.assertEqual(self.ina._gain, self.ina.GAIN_1_40MV)
         self.assertTrue(self.ina._auto_gain_enabled)
-        calls = [call(0x05, [0x83, 0x33]), call(0x00, [0x01, 0x9f])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
+        calls = [call(0x05, b'\x83\x33'), call(0x00, b'\x01\x9f')]
+        self.assertEqual(self.ina._i2c.writeList.call_args_list, calls)
 
-    @patch('Adafruit_GPIO.I2C.get_i2c_device')
-    def test_manual_gain_no_expected_amps(self, device):
-        device.return_value = Mock()
+    def test_manual_gain_no_expected_amps(self):
         self.ina = INA219(0.1)
         self.ina._i2c.writeList = Mock()
         self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
         self.assertEqual(self.ina._gain, self.ina.GAIN_1_40MV)
         self.assertFalse(self.ina._auto_gain_enabled)
-        calls = [call(0x05, [0x83, 0x33]), call(0x00, [0x01, 0x9f])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
+        calls = [call(0x05, b'\x83\x33'), call(0x00, b'\x01\x9f')]
+        self.assertEqual(self.ina._i2c.writeList.call_args_list, calls)
 
-    @patch('Adafruit_GPIO.I2C.get_i2c_device')
-    def test_auto_gain_out_of_range(self, device):
-        device.return_value = Mock()
+    def test_auto_gain_out_of_range(self):
         self.ina = INA219(0.1, 4)
-        with self.assertRaisesRegexp(ValueError, "Expected amps"):
+        with self.assertRaisesRegex(ValueError, "Expected amps"):
+            self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_AUTO)
+
+    def test_auto_gain_at_maximum_shunt_voltage(self):
+        self.ina = INA219(1.0, 0.32)
+        with self.assertRaisesRegex(ValueError, "Expected amps"):
             self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_AUTO)
 
     def test_16v_40mv(self):
         self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
         self.assertEqual(self.ina._gain, 0)
-        calls = [call(0x05, [0x83, 0x33]), call(0x00, [0x01, 0x9f])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
+        calls = [call(0x05, b'\x83\x33'), call(0x00, b'\x01\x9f')]
+        self.assertEqual(self.ina._i2c.writeList.call_args_list, calls)
+
+    def test_configuration_register(self):
+        ina = self.ina
+        settings = [
+            ((ina.RANGE_32V, ina.GAIN_1_40MV), b'\x21\x9f'),
+            ((ina.RANGE_32V, ina.GAIN_2_80MV), b'\x29\x9f'),
+            ((ina.RANGE_32V, ina.GAIN_4_160MV), b'\x31\x9f'),
+            ((ina.RANGE_32V, ina.GAIN_8_320MV), b'\x39\x9f'),
+            ((ina.RANGE_32V, ina.GAIN_1_40MV,
+              ina.ADC_9BIT, ina.ADC_9BIT), b'\x20\x07'),
+            ((ina.RANGE_32V, ina.GAIN_1_40MV,
+              ina.ADC_10BIT, ina.ADC_11BIT), b'\x20\x97'),
+            ((ina.RANGE_32V, ina.GAIN_1_40MV,
+              ina.ADC_2SAMP, ina.ADC_128SAMP), b'\x24\xff'),
+            ((ina.RANGE_32V, ina.GAIN_1_40MV,
+              ina.ADC_4SAMP, ina.ADC_8SAMP), b'\x25\x5f'),
+            ((ina.RANGE_32V, ina.GAIN_1_40MV,
+              ina.ADC_8SAMP, ina.ADC_16SAMP), b'\x25\xe7'),
+            ((ina.RANGE_32V, ina.GAIN_1_40MV,
+              ina.ADC_32SAMP, ina.ADC_64SAMP), b'\x26\xf7'),
+        ]
+        for args, configuration in settings:
+            with self.subTest(args=args):
+                ina._i2c.writeList.reset_mock()
+                ina.configure(*args)
+                calls = [call(0x05, b'\x83\x33'), call(0x00, configuration)]
+                self.assertEqual(ina._i2c.writeList.call_args_list, calls)
+
+    def test_configure_repeated(self):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        self.assertEqual(self.ina._i2c.writeList.call_count, 2)
 
-    def test_32v_40mv(self):
+    def test_configure_repeated_different_settings(self):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
         self.ina.configure(self.ina.RANGE_32V, self.ina.GAIN_1_40MV)
-        calls = [call(0x05, [0x83, 0x33]), call(0x00, [0x21, 0x9f])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
+        self.assertEqual(self.ina._i2c.writeList.call_count, 4)
+        self.ina._i2c.writeList.assert_called_with(0x00, b'\x21\x9f')
 
-    def test_32v_80mv(self):
-        self.ina.configure(self.ina.RANGE_32V, self.ina.GAIN_2_80MV)
-        calls = [call(0x05, [0x83, 0x33]), call(0x00, [0x29, 0x9f])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
-
-    def test_32v_160mv(self):
-        self.ina.configure(self.ina.RANGE_32V, self.ina.GAIN_4_160MV)
-        calls = [call(0x05, [0x83, 0x33]), call(0x00, [0x31, 0x9f])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
+    def test_configure_repeated_after_sleep(self):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        self.ina.sleep()
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        self.assertEqual(self.ina._i2c.writeList.call_count, 5)
+        self.ina._i2c.writeList.assert_called_with(0x00, b'\x01\x9f')
 
-    def test_32v_320mv(self):
-        self.ina.configure(self.ina.RANGE_32V, self.ina.GAIN_8_320MV)
-        calls = [call(0x05, [0x83, 0x33]), call(0x00, [0x39, 0x9f])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
-
-    def test_32v_40mv_9bit(self):
-        self.ina.configure(
-            self.ina.RANGE_32V, self.ina.GAIN_1_40MV,
-            self.ina.ADC_9BIT, self.ina.ADC_9BIT)
-        calls = [call(0x05, [0x83, 0x33]), call(0x00, [0x20, 0x07])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
-
-    def test_32v_40mv_10_bit_11_bit(self):
-        self.ina.configure(
-            self.ina.RANGE_32V, self.ina.GAIN_1_40MV,
-            self.ina.ADC_10BIT, self.ina.ADC_11BIT)
-        calls = [call(0x05, [0x83, 0x33]), call(0x00, [0x20, 0x97])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
-
-    def test_32v_40mv_2_samples_128_samples(self):
-        self.ina.configure(
-            self.ina.RANGE_32V, self.ina.GAIN_1_40MV,
-            self.ina.ADC_2SAMP, self.ina.ADC_128SAMP)
-        calls = [call(0x05, [0x83, 0x33]), call(0x00, [0x24, 0xff])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
-
-    def test_32v_40mv_4_samples_8_samples(self):
-        self.ina.configure(
-            self.ina.RANGE_32V, self.ina.GAIN_1_40MV,
-            self.ina.ADC_4SAMP, self.ina.ADC_8SAMP)
-        calls = [call(0x05, [0x83, 0x33]), call(0x00, [0x25, 0x5f])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
-
-    def test_32v_40mv_8_samples_16_samples(self):
-        self.ina.configure(
-            self.ina.RANGE_32V, self.ina.GAIN_1_40MV,
-            self.ina.ADC_8SAMP, self.ina.ADC_16SAMP)
-        calls = [call(0x05, [0x83, 0x33]), call(0x00, [0x25, 0xe7])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
-
-    def test_32v_40mv_32_samples_64_samples(self):
-        self.ina.configure(
-            self.ina.RANGE_32V, self.ina.GAIN_1_40MV,
-            self.ina.ADC_32SAMP, self.ina.ADC_64SAMP)
-        calls = [call(0x05, [0x83, 0x33]), call(0x00, [0x26, 0xf7])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
+    def test_configure_retried_after_error(self):
+        ina = INA219(0.1, 0.5)
+        ina.configure(ina.RANGE_16V, ina.GAIN_AUTO)
+        with self.assertRaisesRegex(ValueError, "Expected current"):
+            ina.configure(ina.RANGE_16V, ina.GAIN_1_40MV)
+        self.assertEqual(ina._gain, ina.GAIN_2_80MV)
+        self.assertTrue(ina._auto_gain_enabled)
+        ina._i2c.writeList.reset_mock()
+        ina.configure(ina.RANGE_16V, ina.GAIN_AUTO)
+        calls = [call(0x05, b'\x68\xf5'), call(0x00, b'\x09\x9f')]
+        self.assertEqual(ina._i2c.writeList.call_args_list, calls)
+        self.assertEqual(ina._gain, ina.GAIN_2_80MV)
 
     def test_invalid_voltage_range(self):
-        with self.assertRaisesRegexp(ValueError, "Invalid voltage range"):
+        with self.assertRaisesRegex(ValueError, "Invalid voltage range"):
             self.ina.configure(64, self.ina.GAIN_1_40MV)
 
-    @patch('Adafruit_GPIO.I2C.get_i2c_device')
-    def test_max_current_exceeded(self, device):
-        device.return_value = Mock()
+    def test_max_current_exceeded(self):
         ina = INA219(0.1, 0.5)
-        with self.assertRaisesRegexp(ValueError, "Expected current"):
+        with self.assertRaisesRegex(ValueError, "Expected current"):
             ina.configure(ina.RANGE_32V, ina.GAIN_1_40MV)
 
     def test_sleep(self):
         self.ina._i2c.readU16BE = Mock(return_value=0xf)
         self.ina.sleep()
-        self.ina._i2c.writeList.assert_called_with(0x00, [0x00, 0x08])
+        self.ina._i2c.writeList.assert_called_with(0x00, b'\x00\x08')
 
     def test_wake(self):
         self.ina._i2c.readU16BE = Mock(return_value=0x8)
         self.ina.wake()
-        self.ina._i2c.writeList.assert_called_with(0x00, [0x00, 0xf])
+        self.ina._i2c.writeList.assert_called_with(0x00, b'\x00\x0f')
+
+    def test_sleep_after_configure(self):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        self.ina._i2c.readU16BE = Mock()
+        self.ina.sleep()
+        self.ina._i2c.writeList.assert_called_with(0x00, b'\x01\x98')
+        self.ina._i2c.readU16BE.assert_not_called()
+
+    def test_wake_after_sleep(self):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        self.ina._i2c.readU16BE = Mock()
+        self.ina.sleep()
+        self.ina.wake()
+        self.ina._i2c.writeList.assert_called_with(0x00, b'\x01\x9f')
+        self.ina._i2c.readU16BE.assert_not_called()
+
+    def test_wake_after_reset(self):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        self.ina.reset()
+        self.ina._i2c.readU16BE = Mock()
+        self.ina.sleep()
+        self.ina.wake()
+        self.ina._i2c.writeList.assert_called_with(0x00, b'\x39\x9f')
+        self.ina._i2c.readU16BE.assert_not_called()
+
+    def test_reset_conversion_time(self):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV,
+                           self.ina.ADC_128SAMP, self.ina.ADC_128SAMP)
+        self.ina._i2c.readU16BE = Mock(return_value=0xfa0)
+        self.ina.voltage()
+        self.ina.reset()
+        self.assertAlmostEqual(self.ina._conversion_secs, 0.001064)
+        self.assertIsNone(self.ina._bus_register_time)
+
+    def test_configure_after_reset(self):
+        self.ina.configure(self.ina.RANGE_32V, self.ina.GAIN_8_320MV)
+        self.ina.reset()
+        self.ina._i2c.writeList.reset_mock()
+        self.ina.configure(self.ina.RANGE_32V, self.ina.GAIN_8_320MV)
+        self.ina._i2c.writeList.assert_any_call(0x00, b'\x39\x9f')
 
     def test_reset(self):
         self.ina.reset()
-        self.ina._i2c.writeList.assert_called_with(0x00, [0x80, 0x00])
+        self.ina._i2c.writeList.assert_called_with(0x00, b'\x80\x00')
@@ -1,19 +1,21 @@
-import sys
 import logging
 import unittest
-from mock import Mock, patch
+from decimal import Decimal
 from ina219 import INA219
+from tests import patch_i2c_device
 
-logger = logging.getLogger()
-logger.level = logging.ERROR
-logger.addHandler(logging.StreamHandler(sys.stdout))
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class TestConstructor(unittest.TestCase):
 
-    @patch('Adafruit_GPIO.I2C.get_i2c_device')
-    def test_default(self, device):
-        device.return_value = Mock()
+    def setUp(self):
+        patch_i2c_device(self)
+
+    def test_default(self):
         self.ina = INA219(0.1)
         self.assertEqual(self.ina._shunt_ohms, 0.1)
         self.assertIsNone(self.ina._max_expected_amps)
@@ -21,9 +23,31 @@ class TestConstructor(unittest.TestCase):
         self.assertFalse(self.ina._auto_gain_enabled)
         self.assertAlmostEqual(self.ina._min_device_current_lsb, 6.25e-6, 2)
 
-    @patch('Adafruit_GPIO.I2C.get_i2c_device')
-    def test_with_max_expected_amps(self, device):
-        device.return_value = Mock()
+    def test_with_max_expected_amps(self):
         self.ina = INA219(0.1, 0.4)
         self.assertEqual(self.ina._shunt_ohms, 0.1)
         self.assertEqual(self.ina._max_expected_amps, 0.4)
+
+    def test_decimal_shunt_ohms_and_max_expected_amps(self):
+        self.ina = INA219(Decimal('0.1'), Decimal('0.4'))
+        self.assertAlmostEqual(self.ina._min_device_current_lsb, 6.25e-6, 2)
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_2_80MV)
+        self.assertAlmostEqual(self.ina._current_lsb, 0.4 / 32800, 9)
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_AUTO)
+        self.assertEqual(self.ina._gain, self.ina.GAIN_2_80MV)
+        self.assertAlmostEqual(self.ina._current_lsb, 0.4 / 32800, 9)
+
+    @unittest.skipIf(numpy is None, 'numpy not installed')
+    def test_numpy_shunt_ohms_and_max_expected_amps(self):
+        self.ina = INA219(numpy.float32(0.1), numpy.float32(0.4))
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_2_80MV)
+        self.assertAlmostEqual(self.ina._current_lsb, 0.4 / 32800, 9)
+
+    def test_log_level(self):
+        self.ina = INA219(0.1)
+        self.assertEqual(self.ina.logger.level, logging.ERROR)
+        self.addCleanup(self.ina.logger.setLevel, logging.ERROR)
+        self.ina = INA219(0.1, log_level=logging.DEBUG)
+        self.assertEqual(self.ina.logger.level, logging.DEBUG)
+        self.ina = INA219(0.1)
+        self.assertEqual(self.ina.logger.level, logging.DEBUG)
@@ -0,0 +1,60 @@
+import unittest
+from mock import Mock, call, patch
+from ina219 import INA219
+from ina219 import I2cDevice
+from ina219 import Smbus2I2cDevice
+from tests import patch_i2c_device
+
+
+class TestI2cDevice(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.dict(Smbus2I2cDevice._buses, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_custom_i2c_device(self):
+        device = patch_i2c_device(self)
+        i2c_device = Mock(spec_set=I2cDevice)
+        i2c_device.readU16BE = Mock(return_value=0x2592)
+        self.ina = INA219(0.1, i2c_device=i2c_device)
+        self.assertEqual(self.ina.voltage(), 4.808)
+        device.assert_not_called()
+
+    @patch('ina219.smbus2')
+    def test_smbus2_read_unsigned(self, smbus2):
+        smbus2.i2c_msg.read.return_value = b'\xfa\x00'
+        i2c_device = Smbus2I2cDevice(0x41, 1)
+        self.assertEqual(i2c_device.readU16BE(0x02), 0xfa00)
+        smbus2.SMBus.assert_called_with(1)
+        smbus2.i2c_msg.write.assert_called_with(0x41, [0x02])
+        smbus2.i2c_msg.read.assert_called_with(0x41, 2)
+        smbus2.SMBus.return_value.i2c_rdwr.assert_called_once_with(
+            smbus2.i2c_msg.write.return_value,
+            smbus2.i2c_msg.read.return_value)
+
+    @patch('ina219.smbus2')
+    def test_smbus2_read_signed(self, smbus2):
+        smbus2.i2c_msg.read.return_value = b'\xb2\xae'
+        i2c_device = Smbus2I2cDevice(0x40, 1)
+        self.assertEqual(i2c_device.readS16BE(0x04), -0x4d52)
+
+    @patch('ina219.smbus2')
+    def test_smbus2_write(self, smbus2):
+        i2c_device = Smbus2I2cDevice(0x40, 1)
+        i2c_device.writeList(0x05, b'\x83\x33')
+        smbus2.i2c_msg.write.assert_called_with(0x40, b'\x05\x83\x33')
+        smbus2.SMBus.return_value.i2c_rdwr.assert_has_calls(
+            [call(smbus2.i2c_msg.write.return_value)])
+
+    @patch('ina219.smbus2')
+    def test_smbus2_bus_shared(self, smbus2):
+        Smbus2I2cDevice(0x40, 1)
+        Smbus2I2cDevice(0x41, 1)
+        Smbus2I2cDevice(0x40, 2)
+        self.assertEqual(smbus2.SMBus.call_args_list, [call(1), call(2)])
+
+    @patch('ina219.smbus2', None)
+    def test_smbus2_not_installed(self):
+        with self.assertRaisesRegex(ImportError, "requires the smbus2"):
+            Smbus2I2cDevice(0x40, 1)
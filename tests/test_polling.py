@@ -0,0 +1,108 @@
+import threading
+import unittest
+from mock import Mock
+from ina219 import INA219
+from ina219 import DeviceRangeError
+from tests import patch_i2c_device
+
+
+class TestPolling(unittest.TestCase):
+
+    def setUp(self):
+        patch_i2c_device(self)
+        self.ina = INA219(0.1, 0.4)
+        self.ina._i2c.writeList = Mock()
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        self.ina._i2c.readU16BE = Mock(return_value=0x2592)
+        self.ina._i2c.readS16BE = Mock(return_value=0x7d0)
+        self.readings = []
+        self.done = threading.Event()
+
+    def tearDown(self):
+        self.ina.stop_polling()
+
+    def on_reading(self, reading):
+        self.readings.append(reading)
+        if len(self.readings) == 3:
+            self.done.set()
+
+    def test_polling(self):
+        self.ina.start_polling(0.001, self.on_reading)
+        self.assertTrue(self.done.wait(5))
+        thread = self.ina._poll_thread
+        self.ina.stop_polling()
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(self.readings[0].voltage, 4.808)
+        self.assertEqual(self.readings[0].shunt_voltage, 20.0)
+
+    def test_polling_already_started(self):
+        self.ina.start_polling(1, self.on_reading)
+        with self.assertRaisesRegex(RuntimeError, "already been started"):
+            self.ina.start_polling(1, self.on_reading)
+
+    def test_polling_on_error(self):
+        self.ina._i2c.readU16BE = Mock(return_value=0xfa1)
+        errors = []
+
+        def on_error(error):
+            errors.append(error)
+            self.done.set()
+
+        self.ina.start_polling(0.001, self.on_reading, on_error)
+        self.assertTrue(self.done.wait(5))
+        self.ina.stop_polling()
+        self.assertIsInstance(errors[0], DeviceRangeError)
+        self.assertEqual(self.readings, [])
+
+    def test_polling_on_bus_error(self):
+        self.ina._i2c.readU16BE = Mock(side_effect=OSError(121))
+        errors = []
+
+        def on_error(error):
+            errors.append(error)
+            self.done.set()
+
+        self.ina.start_polling(0.001, self.on_reading, on_error)
+        self.assertTrue(self.done.wait(5))
+        self.ina.stop_polling()
+        self.assertIsInstance(errors[0], OSError)
+
+    def test_polling_continues_when_on_error_raises(self):
+        self.ina._i2c.readU16BE = Mock(side_effect=OSError(121))
+        errors = []
+
+        def on_error(error):
+            errors.append(error)
+            if len(errors) == 2:
+                self.done.set()
+            raise ValueError('handler failed')
+
+        with self.assertLogs('ina219', 'ERROR'):
+            self.ina.start_polling(0.001, self.on_reading, on_error)
+            self.assertTrue(self.done.wait(5))
+            self.assertTrue(self.ina._poll_thread.is_alive())
+            self.ina.stop_polling()
+
+    def test_polling_stops_on_error(self):
+        self.ina._i2c.readU16BE = Mock(side_effect=OSError(121))
+        with self.assertLogs('ina219', 'ERROR'):
+            self.ina.start_polling(0.001, self.on_reading)
+            self.ina._poll_thread.join(5)
+        self.assertFalse(self.ina._poll_thread.is_alive())
+
+    def test_restart_polling_from_callback(self):
+        threads = []
+
+        def on_reading(reading):
+            threads.append(self.ina._poll_thread)
+            self.ina.stop_polling()
+            self.ina.start_polling(1, lambda reading: self.done.set())
+
+        self.ina.start_polling(0.001, on_reading)
+        self.assertTrue(self.done.wait(5))
+        threads[0].join(5)
+        self.assertFalse(threads[0].is_alive())
+        self.assertEqual(len(threads), 1)
+
+    def test_stop_polling_not_started(self):
+        self.ina.stop_polling()
@@ -1,23 +1,22 @@
-import sys
-import logging
+import itertools
 import unittest
 from mock import Mock, patch
 from ina219 import INA219
 from ina219 import DeviceRangeError
+from tests import patch_i2c_device
 
-
-logger = logging.getLogger()
-logger.level = logging.ERROR
-logger.addHandler(logging.StreamHandler(sys.stdout))
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class TestRead(unittest.TestCase):
 
     GAIN_RANGE_MSG = r"Current out of range \(overflow\)"
 
-    @patch('Adafruit_GPIO.I2C.get_i2c_device')
-    def setUp(self, device):
-        device.return_value = Mock()
+    def setUp(self):
+        patch_i2c_device(self)
         self.ina = INA219(0.1, 0.4)
         self.ina._i2c.writeList = Mock()
 
@@ -38,9 +37,18 @@ class TestRead(unittest.TestCase):
         self.assertEqual(self.ina.voltage(), 0.004)
 
     def test_read_supply_voltage(self):
-        self.ina.voltage = Mock(return_value=2.504)
-        self.ina.shunt_voltage = Mock(return_value=35.000)
-        self.assertEqual(self.ina.supply_voltage(), 2.539)
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        self.ina._i2c.readU16BE = Mock(return_value=0x1390)
+        self.ina._i2c.readS16BE = Mock(return_value=0xdac)
+        self.assertAlmostEqual(self.ina.supply_voltage(), 2.539, 6)
+        self.assertEqual(self.ina._i2c.readU16BE.call_count, 1)
+        self.assertEqual(self.ina._i2c.readS16BE.call_count, 1)
+
+    def test_read_supply_voltage_current_overflow_error(self):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        self.ina._i2c.readU16BE = Mock(return_value=0x1391)
+        with self.assertRaisesRegex(DeviceRangeError, self.GAIN_RANGE_MSG):
+            self.ina.supply_voltage()
 
     def test_read_0v(self):
         self.ina._i2c.readU16BE = Mock(return_value=0)
@@ -93,6 +101,91 @@ class TestRead(unittest.TestCase):
         self.ina._i2c.readS16BE = Mock(return_value=-0xfa0)
         self.assertEqual(self.ina.shunt_voltage(), -40.0)
 
+    def test_read_all(self):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        self.ina._i2c.readU16BE = Mock(side_effect=[0x2592, 0x1ea9])
+        self.ina._i2c.readS16BE = Mock(side_effect=[0x7d0, 0x1])
+        reading = self.ina.read_all()
+        self.assertEqual(reading.voltage, 4.808)
+        self.assertEqual(reading.shunt_voltage, 20.0)
+        self.assertAlmostEqual(reading.current, 0.012, 3)
+        self.assertAlmostEqual(reading.power, 1914.0, 0)
+
+    @patch('ina219.time.monotonic', Mock(return_value=10.0))
+    def test_read_all_wait_for_conversion(self):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        self.ina._i2c.readU16BE = Mock(side_effect=[0x2590, 0x2592, 0x1ea9])
+        self.ina._i2c.readS16BE = Mock(side_effect=[0x7d0, 0x1])
+        reading = self.ina.read_all(wait_for_conversion=True)
+        self.assertEqual(reading.voltage, 4.808)
+        self.assertAlmostEqual(reading.power, 1914.0, 0)
+
+    @patch('ina219.time.monotonic', Mock(return_value=10.0))
+    def test_read_all_wait_for_conversion_without_conversion_time(self):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        self.ina._conversion_secs = 0
+        self.ina._i2c.readU16BE = Mock(
+            side_effect=[0x2590, 0x2590, 0x2592, 0x2592, 0x1ea9])
+        self.ina._i2c.readS16BE = Mock(side_effect=[0x7d0, 0x1])
+        with patch('ina219.time.sleep') as sleep:
+            self.ina.read_all(wait_for_conversion=True)
+        self.assertEqual(sleep.call_count, 2)
+        for delay_call in sleep.call_args_list:
+            self.assertGreater(delay_call[0][0], 0)
+
+    @patch('ina219.time.monotonic', Mock(side_effect=itertools.count()))
+    def test_read_all_wait_for_conversion_timeout(self):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        self.ina._i2c.readU16BE = Mock(return_value=0x2590)
+        with patch('ina219.time.sleep'):
+            with self.assertRaisesRegex(TimeoutError, "conversion"):
+                self.ina.read_all(wait_for_conversion=True)
+
+    @unittest.skipIf(numpy is None, 'numpy not installed')
+    def test_read_many(self):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        self.ina._i2c.readU16BE = Mock(
+            side_effect=[0x2592, 0x1ea9, 0x7d00, 0])
+        self.ina._i2c.readS16BE = Mock(side_effect=[0x7d0, 0x1, -0xfa0, 0])
+        reading = self.ina.read_many(2)
+        self.assertEqual(list(reading.voltage), [4.808, 16])
+        self.assertEqual(list(reading.shunt_voltage), [20.0, -40.0])
+        self.assertAlmostEqual(reading.current[0], 0.012, 3)
+        self.assertEqual(reading.current[1], 0)
+        self.assertAlmostEqual(reading.power[0], 1914.0, 0)
+        self.assertEqual(reading.power[1], 0)
+
+    @patch('ina219.numpy', None)
+    def test_read_many_requires_numpy(self):
+        with self.assertRaisesRegex(ImportError, "requires the numpy"):
+            self.ina.read_many(2)
+
+    def test_read_all_current_overflow_error(self):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_2_80MV)
+        self.ina._i2c.readU16BE = Mock(return_value=0xfa1)
+        with self.assertRaisesRegex(DeviceRangeError, self.GAIN_RANGE_MSG):
+            self.ina.read_all()
+
+    @patch('ina219.time.monotonic')
+    def test_current_reuses_recent_voltage_read(self, monotonic):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        monotonic.side_effect = [10.0, 10.0005]
+        self.ina._i2c.readU16BE = Mock(return_value=0xfa0)
+        self.ina._i2c.readS16BE = Mock(return_value=0x1)
+        self.ina.voltage()
+        self.assertAlmostEqual(self.ina.current(), 0.012, 3)
+        self.assertEqual(self.ina._i2c.readU16BE.call_count, 1)
+
+    @patch('ina219.time.monotonic')
+    def test_current_rereads_stale_voltage_read(self, monotonic):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV)
+        monotonic.side_effect = [10.0, 10.01, 10.01]
+        self.ina._i2c.readU16BE = Mock(side_effect=[0xfa0, 0xfa1])
+        self.ina._i2c.readS16BE = Mock(return_value=0x1)
+        self.ina.voltage()
+        with self.assertRaisesRegex(DeviceRangeError, self.GAIN_RANGE_MSG):
+            self.ina.current()
+
     def test_current_overflow_valid(self):
         self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_2_80MV)
         self.ina._i2c.readU16BE = Mock(return_value=0xfa1)
@@ -101,9 +194,40 @@ class TestRead(unittest.TestCase):
     def test_current_overflow_error(self):
         self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_2_80MV)
         self.ina._i2c.readU16BE = Mock(return_value=0xfa1)
-        with self.assertRaisesRegexp(DeviceRangeError, self.GAIN_RANGE_MSG):
+        with self.assertRaisesRegex(DeviceRangeError, self.GAIN_RANGE_MSG):
             self.ina.current()
 
+    def test_current_without_overflow_check(self):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_2_80MV,
+                           check_overflow=False)
+        self.ina._i2c.readU16BE = Mock(return_value=0xfa1)
+        self.ina._i2c.readS16BE = Mock(return_value=0xfa0)
+        self.assertAlmostEqual(self.ina.current(), 48.8, 1)
+        self.ina._i2c.readU16BE.assert_not_called()
+
+    def test_read_all_overflow_error_without_overflow_check(self):
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_2_80MV,
+                           check_overflow=False)
+        self.ina._i2c.readU16BE = Mock(return_value=0xfa1)
+        self.ina._i2c.readS16BE = Mock(return_value=0xfa0)
+        with self.assertRaisesRegex(DeviceRangeError, self.GAIN_RANGE_MSG):
+            self.ina.read_all()
+
+    def test_overflow_check_kept_with_auto_gain(self):
+        self.ina.configure(self.ina.RANGE_16V, check_overflow=False)
+        self.assertTrue(self.ina._check_overflow)
+
+    def test_reconfigure_auto_gain_to_fixed_gain(self):
+        self.ina.configure(self.ina.RANGE_16V)
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_1_40MV,
+                           check_overflow=False)
+        self.assertFalse(self.ina._auto_gain_enabled)
+        self.assertFalse(self.ina._check_overflow)
+        self.ina._i2c.readU16BE = Mock(return_value=0xfa1)
+        self.ina._i2c.readS16BE = Mock(return_value=0x1)
+        self.assertAlmostEqual(self.ina.current(), 0.012, 3)
+        self.assertEqual(self.ina._gain, self.ina.GAIN_1_40MV)
+
     def test_new_read_available(self):
         self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_2_80MV)
         self.ina._i2c.readU16BE = Mock(return_value=0xA)
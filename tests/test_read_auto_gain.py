@@ -1,47 +1,73 @@
-import sys
-import logging
 import unittest
 from mock import Mock, call, patch
 from ina219 import INA219
 from ina219 import DeviceRangeError
-
-logger = logging.getLogger()
-logger.level = logging.ERROR
-logger.addHandler(logging.StreamHandler(sys.stdout))
+from tests import patch_i2c_device
 
 
 class TestReadAutoGain(unittest.TestCase):
 
     GAIN_RANGE_MSG = r"Current out of range \(overflow\)"
 
-    @patch('Adafruit_GPIO.I2C.get_i2c_device')
-    def test_auto_gain(self, device):
-        device.return_value = Mock()
+    def setUp(self):
+        patch_i2c_device(self)
+
+    def test_auto_gain(self):
         self.ina = INA219(0.1, 0.4)
         self.ina._i2c.writeList = Mock()
         self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_AUTO)
 
         self.ina._read_voltage_register = Mock()
-        self.ina._read_voltage_register.side_effect = [0xfa1, 0xfa0]
-        self.ina._read_configuration = Mock()
-        self.ina._read_configuration.side_effect = [0x99f, 0x99f]
+        self.ina._read_voltage_register.side_effect = [
+            0xfa1, 0xfa2, 0xfa2]
         self.ina._current_register = Mock(return_value=100)
 
         self.assertAlmostEqual(self.ina.current(), 4.878, 3)
 
-        calls = [call(0x05, [0x83, 0x33]), call(0x00, [0x09, 0x9f]),
-                 call(0x05, [0x20, 0xcc]), call(0x00, [0x11, 0x9f])]
-        self.ina._i2c.writeList.assert_has_calls(calls)
+        calls = [call(0x05, b'\x83\x33'), call(0x00, b'\x09\x9f'),
+                 call(0x05, b'\x20\xcc'), call(0x00, b'\x11\x9f')]
+        self.assertEqual(self.ina._i2c.writeList.call_args_list, calls)
+
+    def test_auto_gain_waits_for_conversion(self):
+        self.ina = INA219(0.1, 0.4)
+        self.ina._i2c.writeList = Mock()
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_AUTO)
+
+        self.ina._read_voltage_register = Mock()
+        self.ina._read_voltage_register.side_effect = [
+            0xfa1, 0xfa0, 0xfa0, 0xfa2, 0xfa2]
+        self.ina._current_register = Mock(return_value=100)
+
+        with patch('ina219.time.sleep') as sleep:
+            self.assertAlmostEqual(self.ina.current(), 4.878, 3)
+        self.assertEqual(self.ina._read_voltage_register.call_count, 5)
+        self.ina._i2c.readU16BE.assert_not_called()
+        delays = [c[0][0] for c in sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertAlmostEqual(delays[1], 2 * delays[0])
 
-    @patch('Adafruit_GPIO.I2C.get_i2c_device')
-    def test_auto_gain_out_of_range(self, device):
-        device.return_value = Mock()
+    def test_auto_gain_out_of_range(self):
         self.ina = INA219(0.1, 3.0)
         self.ina._i2c.writeList = Mock()
         self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_AUTO)
 
         self.ina._read_voltage_register = Mock(return_value=0xfa1)
-        self.ina._read_configuration = Mock(return_value=0x199f)
+        self.ina._read_configuration = Mock()
+
+        with self.assertRaisesRegex(DeviceRangeError, self.GAIN_RANGE_MSG):
+            self.ina.current()
+        self.ina._read_configuration.assert_not_called()
+
+    def test_auto_gain_after_reset(self):
+        self.ina = INA219(0.1, 0.4)
+        self.ina._i2c.writeList = Mock()
+        self.ina.configure(self.ina.RANGE_16V, self.ina.GAIN_AUTO)
+        self.ina.reset()
+        self.assertEqual(self.ina._gain, self.ina.GAIN_8_320MV)
+        self.ina._i2c.writeList.reset_mock()
+
+        self.ina._read_voltage_register = Mock(return_value=0xfa1)
 
-        with self.assertRaisesRegexp(DeviceRangeError, self.GAIN_RANGE_MSG):
+        with self.assertRaisesRegex(DeviceRangeError, self.GAIN_RANGE_MSG):
             self.ina.current()
+        self.ina._i2c.writeList.assert_not_called()